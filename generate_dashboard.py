@@ -14,12 +14,105 @@ Options:
     --title TITLE           Custom dashboard title
     --style STYLE           Background style (default: presentation)
     --colors SCHEME         Color scheme (default: hdfc_brand)
+    --force                 Re-render charts even if they are up to date
+                            (newer than the Excel file, same options and code)
+    --palette-png           Save charts as smaller 8-bit palette PNGs
 """
 
 import argparse
+import multiprocessing as mp
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import matplotlib
+matplotlib.use("Agg")  # Batch rendering only - no GUI backend needed
+
 import pandas as pd
-from hdfc_viz import create_dashboard, COLOR_SCHEMES, BG_STYLES
+from hdfc_viz import create_dashboard, group_columns, set_source_mtime, COLOR_SCHEMES, BG_STYLES
+
+# Parquet cache of cleaned sheets written by remove_subtotal.py
+CACHE_DIR = 'cache'
+
+def load_sheets(file_path, sheet=None):
+    """
+    Load the requested sheets, preferring the Parquet cache written by remove_subtotal.py.
+    
+    A cached sheet is only used when the source path and modification time stored
+    in it match file_path; any other sheets are read from the workbook in a single pass.
+    """
+    workbook_name = os.path.splitext(os.path.basename(file_path))[0]
+    source = {'source_path': os.path.abspath(file_path), 'source_mtime': os.path.getmtime(file_path)}
+    
+    # One handle serves both the sheet list and any sheets read from Excel
+    with pd.ExcelFile(file_path, engine="openpyxl") as excel_file:
+        sheet_names = [sheet] if sheet else excel_file.sheet_names
+        
+        sheets = {}
+        for name in sheet_names:
+            cache_path = os.path.join(CACHE_DIR, workbook_name, f"{name}.parquet")
+            if os.path.exists(cache_path):
+                try:
+                    cached = pd.read_parquet(cache_path)
+                except ImportError:
+                    break  # No Parquet engine installed - read everything from Excel
+                # The cache directory is keyed on the file name only, so check it was built from this file
+                if cached.attrs == source:
+                    cached.attrs = {}
+                    sheets[name] = cached
+        
+        missing = [name for name in sheet_names if name not in sheets]
+        if missing:
+            sheets.update(pd.read_excel(excel_file, sheet_name=missing))
+    
+    # Keep the workbook's sheet order
+    return {name: sheets[name] for name in sheet_names}
+
+def _process_sheet(item, options):
+    """
+    Generate the dashboard for a single (sheet name, DataFrame) pair.
+    
+    Runs in a worker process, so it returns a status message for the parent
+    to print instead of writing to stdout directly.
+    """
+    sheet, df = item
+    
+    # Charts saved after the source file last changed are skipped
+    set_source_mtime(options['source_mtime'])
+    
+    try:
+        # Use the Category column as the index
+        df = df.set_index("Category")
+        
+        # Group columns into 4-column groups
+        column_groups = group_columns(df.columns)
+        
+        # Custom title based on sheet name if not provided
+        title_prefix = options['title'] if options['title'] else "HDFC"
+        
+        # Create dashboard
+        output_path = os.path.join(options['output'], f"HDFC_{sheet}")
+        dashboard = create_dashboard(
+            df=df,
+            sheet_name=sheet,
+            column_groups=column_groups,
+            output_path=output_path,
+            title_prefix=title_prefix,
+            color_schemes=[options['colors']],
+            bg_style=options['style'],
+            show_plots=False,  # Don't show plots, just save them
+            dpi=options['dpi'],
+            palette_png=options['palette_png']
+        )
+        
+        generated = sum(fig is not None for fig, _ in dashboard)
+        message = f"  - Generated {generated} chart groups for {sheet}"
+        if generated < len(dashboard):
+            message += f" ({len(dashboard) - generated} up to date, skipped)"
+        return message
+        
+    except Exception as e:
+        return f"Error processing sheet {sheet}: {e}"
 
 def main():
     # Parse command line arguments
@@ -33,57 +126,43 @@ def main():
                         help='Background style')
     parser.add_argument('--colors', default='hdfc_brand', choices=list(COLOR_SCHEMES.keys()),
                         help='Color scheme')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render charts even if they are newer than the Excel file')
+    parser.add_argument('--palette-png', action='store_true',
+                        help='Save charts as 8-bit palette PNGs (smaller, slightly rougher text)')
     
     args = parser.parse_args()
     
     # Create output directory if it doesn't exist
     os.makedirs(args.output, exist_ok=True)
     
-    # Load Excel file
-    excel_file = pd.ExcelFile(args.file)
+    # Load all requested sheets (from the Parquet cache when it is up to date)
+    try:
+        all_sheets = load_sheets(args.file, args.sheet)
+    except ValueError as e:
+        # A --sheet that isn't in the workbook is reported like any other failing sheet
+        if not args.sheet:
+            raise
+        print(f"Processing sheet: {args.sheet}")
+        print(f"Error processing sheet {args.sheet}: {e}")
+        all_sheets = {}
     
-    # Get list of sheets to process
-    sheets = [args.sheet] if args.sheet else excel_file.sheet_names
-    
-    # Process each sheet
-    for sheet in sheets:
-        print(f"Processing sheet: {sheet}")
-        
-        try:
-            # Load the data
-            df = pd.read_excel(args.file, index_col="Category", sheet_name=sheet)
-            
-            # Define column groups - adjust based on number of columns
-            n_cols = len(df.columns)
-            column_groups = []
-            
-            # Group columns into 4-column groups
-            for i in range(0, n_cols, 4):
-                group = df.columns[i:i+4].tolist()
-                if group:  # Add only non-empty groups
-                    column_groups.append(group)
-            
-            # Custom title based on sheet name if not provided
-            title_prefix = args.title if args.title else "HDFC"
-            
-            # Create dashboard
-            output_path = os.path.join(args.output, f"HDFC_{sheet}")
-            dashboard = create_dashboard(
-                df=df,
-                sheet_name=sheet,
-                column_groups=column_groups,
-                output_path=output_path,
-                title_prefix=title_prefix,
-                color_schemes=[args.colors],
-                bg_style=args.style,
-                show_plots=False,  # Don't show plots, just save them
-                dpi=args.dpi
-            )
-            
-            print(f"  - Generated {len(dashboard)} chart groups for {sheet}")
-            
-        except Exception as e:
-            print(f"Error processing sheet {sheet}: {e}")
+    # Process sheets in parallel - each sheet renders independently.
+    # Use "spawn" so workers never inherit pyplot state from a fork.
+    options = {
+        'output': args.output,
+        'dpi': args.dpi,
+        'title': args.title,
+        'style': args.style,
+        'colors': args.colors,
+        'source_mtime': None if args.force else os.path.getmtime(args.file),
+        'palette_png': args.palette_png
+    }
+    with ProcessPoolExecutor(mp_context=mp.get_context("spawn")) as executor:
+        messages = executor.map(partial(_process_sheet, options=options), all_sheets.items())
+        for sheet, message in zip(all_sheets, messages):
+            print(f"Processing sheet: {sheet}")
+            print(message)
     
     print(f"All dashboards exported to {args.output}")
 
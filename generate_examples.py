@@ -5,107 +5,144 @@ This script generates example visualizations for all sheets in the HDFC_modified
 demonstrating different visual styles, color schemes, and customization options.
 
 Usage:
-    python generate_examples.py
+    python generate_examples.py [--force]
+
+Charts that are newer than the Excel file and were rendered with the same options
+and code are skipped unless --force is given.
 """
 
+import argparse
+import multiprocessing as mp
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
-from hdfc_viz import plot_bar_chart, create_dashboard, COLOR_SCHEMES
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-# Ensure output directory exists
-os.makedirs("exports/examples", exist_ok=True)
-
-# Load the Excel file
-excel_file = "HDFC_modified.xlsx"
-excel = pd.ExcelFile(excel_file)
+import matplotlib
+matplotlib.use("Agg")  # Batch rendering only - no GUI backend needed
 
-# Get all sheet names
-sheet_names = excel.sheet_names
+import matplotlib.pyplot as plt
+from hdfc_viz import plot_bar_chart, create_dashboard, group_columns, set_source_mtime, COLOR_SCHEMES
+from generate_dashboard import load_sheets
 
-print(f"Generating example visualizations for {len(sheet_names)} sheets...")
+# Source workbook
+excel_file = "HDFC_modified.xlsx"
 
 # Examples of different visualization styles
-def generate_examples():
-    """Generate example visualizations for all sheets"""
-    for i, sheet in enumerate(sheet_names):
-        print(f"Processing sheet {i+1}/{len(sheet_names)}: {sheet}")
-        
-        # Load the sheet data
-        df = pd.read_excel(excel_file, sheet_name=sheet, index_col="Category")
-        
-        # 1. Basic example - Default settings
-        columns = df.columns[:min(4, len(df.columns))]
+def _generate_sheet_examples(item, source_mtime=None):
+    """
+    Generate all example visualizations for a single (sheet name, DataFrame) pair.
+    
+    Runs in a worker process and returns a status message for the parent to print.
+    Charts saved after source_mtime are not re-rendered.
+    """
+    sheet, df = item
+    set_source_mtime(source_mtime)
+    
+    # Figures of every chart attempted; up-to-date charts come back as None
+    figures = []
+    
+    # 1. Basic example - Default settings
+    columns = df.columns[:min(4, len(df.columns))]
+    fig, axes = plot_bar_chart(
+        df=df,
+        columns=columns,
+        title=f"HDFC {sheet} - Basic Example",
+        subtitle="Default settings with corporate color scheme",
+        color_scheme='corporate',
+        save_path=f"exports/examples/{sheet}_basic.png",
+        show_plot=False
+    )
+    figures.append(fig)
+    
+    # 2. Professional style - HDFC brand colors
+    columns = df.columns[min(4, len(df.columns)):min(8, len(df.columns))] if len(df.columns) > 4 else df.columns[:min(4, len(df.columns))]
+    if len(columns) > 0:
         fig, axes = plot_bar_chart(
             df=df,
             columns=columns,
-            title=f"HDFC {sheet} - Basic Example",
-            subtitle="Default settings with corporate color scheme",
-            color_scheme='corporate',
-            save_path=f"exports/examples/{sheet}_basic.png",
+            title=f"HDFC {sheet} - Professional Style",
+            subtitle="HDFC brand colors with enhanced presentation style",
+            color_scheme='hdfc_brand',
+            bg_style='presentation',
+            bar_edge_color='white',
+            bar_edge_width=0.5,
+            save_path=f"exports/examples/{sheet}_professional.png",
             show_plot=False
         )
-        
-        # 2. Professional style - HDFC brand colors
-        columns = df.columns[min(4, len(df.columns)):min(8, len(df.columns))] if len(df.columns) > 4 else df.columns[:min(4, len(df.columns))]
-        if len(columns) > 0:
-            fig, axes = plot_bar_chart(
-                df=df,
-                columns=columns,
-                title=f"HDFC {sheet} - Professional Style",
-                subtitle="HDFC brand colors with enhanced presentation style",
-                color_scheme='hdfc_brand',
-                bg_style='presentation',
-                bar_edge_color='white',
-                bar_edge_width=0.5,
-                save_path=f"exports/examples/{sheet}_professional.png",
-                show_plot=False
-            )
-        
-        # 3. Gradient style with custom layout
-        columns = df.columns[:min(6, len(df.columns))]
-        if len(columns) > 0:
-            fig, axes = plot_bar_chart(
-                df=df,
-                columns=columns,
-                title=f"HDFC {sheet} - Gradient Style",
-                subtitle="Blue gradient with 2x3 grid layout",
-                color_scheme='gradient_blue',
-                bg_style='minimal',
-                layout=(2, 3),
-                save_path=f"exports/examples/{sheet}_gradient.png",
-                show_plot=False
-            )
-        
-        # 4. Complete dashboard for the sheet
-        column_groups = []
-        for j in range(0, len(df.columns), 4):
-            cols = df.columns[j:j+4].tolist()
-            if cols:
-                column_groups.append(cols)
-        
-        # Define custom titles for each group
-        custom_titles = {}
-        for j in range(len(column_groups)):
-            custom_titles[j] = f"HDFC {sheet} - Group {j+1}"
-        
-        # Create a dashboard with all column groups
-        dashboard = create_dashboard(
+        figures.append(fig)
+    
+    # 3. Gradient style with custom layout
+    columns = df.columns[:min(6, len(df.columns))]
+    if len(columns) > 0:
+        fig, axes = plot_bar_chart(
             df=df,
-            sheet_name=sheet,
-            column_groups=column_groups,
-            output_path=f"exports/examples/{sheet}_dashboard",
-            title_prefix="HDFC",
-            color_schemes=list(COLOR_SCHEMES.keys()),
-            bg_style='presentation',
-            custom_titles=custom_titles,
-            show_plots=False,
-            dpi=300
+            columns=columns,
+            title=f"HDFC {sheet} - Gradient Style",
+            subtitle="Blue gradient with 2x3 grid layout",
+            color_scheme='gradient_blue',
+            bg_style='minimal',
+            layout=(2, 3),
+            save_path=f"exports/examples/{sheet}_gradient.png",
+            show_plot=False
         )
-        
-        print(f"  - Created {3 + len(dashboard)} visualizations for {sheet}")
+        figures.append(fig)
+    
+    # 4. Complete dashboard for the sheet
+    column_groups = group_columns(df.columns)
+    
+    # Define custom titles for each group
+    custom_titles = {}
+    for j in range(len(column_groups)):
+        custom_titles[j] = f"HDFC {sheet} - Group {j+1}"
+    
+    # Create a dashboard with all column groups
+    dashboard = create_dashboard(
+        df=df,
+        sheet_name=sheet,
+        column_groups=column_groups,
+        output_path=f"exports/examples/{sheet}_dashboard",
+        title_prefix="HDFC",
+        color_schemes=list(COLOR_SCHEMES.keys()),
+        bg_style='presentation',
+        custom_titles=custom_titles,
+        show_plots=False,
+        dpi=300
+    )
+    
+    figures.extend(fig for fig, _ in dashboard)
+    
+    created = sum(fig is not None for fig in figures)
+    message = f"  - Created {created} visualizations for {sheet}"
+    if created < len(figures):
+        message += f" ({len(figures) - created} up to date, skipped)"
+    return message
+
+def generate_examples(force=False):
+    """Generate example visualizations for all sheets (force re-renders up-to-date charts)"""
+    # Ensure output directory exists
+    os.makedirs("exports/examples", exist_ok=True)
+    
+    # Load every sheet (from the Parquet cache when it matches the Excel file)
+    all_sheets = {name: df.set_index("Category") for name, df in load_sheets(excel_file).items()}
+    
+    print(f"Generating example visualizations for {len(all_sheets)} sheets...")
+    
+    # Sheets are independent, so render them in parallel worker processes.
+    # Use "spawn" so workers never inherit pyplot state from a fork.
+    with ProcessPoolExecutor(mp_context=mp.get_context("spawn")) as executor:
+        source_mtime = None if force else os.path.getmtime(excel_file)
+        worker = partial(_generate_sheet_examples, source_mtime=source_mtime)
+        messages = executor.map(worker, all_sheets.items())
+        for i, (sheet, message) in enumerate(zip(all_sheets, messages)):
+            print(f"Processing sheet {i+1}/{len(all_sheets)}: {sheet}")
+            print(message)
     
     print(f"All example visualizations generated in exports/examples/")
 
 if __name__ == "__main__":
-    generate_examples()
+    parser = argparse.ArgumentParser(description='Generate HDFC example visualizations')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render charts even if they are newer than the Excel file')
+    args = parser.parse_args()
+    
+    generate_examples(force=args.force)
@@ -10,7 +10,7 @@ Features:
 """
 
 # Export all functions and variables
-__all__ = ['plot_bar_chart', 'create_dashboard', 'COLOR_SCHEMES', 'BG_STYLES']
+__all__ = ['plot_bar_chart', 'create_dashboard', 'group_columns', 'set_source_mtime', 'COLOR_SCHEMES', 'BG_STYLES']
 
 import pandas as pd
 import numpy as np
@@ -18,9 +18,21 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import matplotlib.patheffects as path_effects
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.text import Annotation
+from matplotlib.figure import Figure
+from PIL import Image
 from matplotlib import cm
 import matplotlib.ticker as mticker
+import hashlib
+import io
+import os
 import textwrap
+from functools import lru_cache
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - the precision ladder then uses NumPy masks
+    njit = None
 
 # Set default style settings
 plt.rcParams['font.family'] = 'sans-serif'
@@ -36,6 +48,13 @@ COLOR_SCHEMES = {
     'gradient_red': ["#fff5f0", "#fee0d2", "#fcbba1", "#fc9272", "#fb6a4a", "#ef3b2c", "#cb181d", "#99000d"]
 }
 
+# Raster encoder settings by file extension - favour fast encoding over smallest file size
+_PIL_KWARGS = {
+    '.png': {'compress_level': 1, 'optimize': False},
+    '.jpg': {'quality': 90, 'progressive': False},
+    '.jpeg': {'quality': 90, 'progressive': False}
+}
+
 # Background styles
 BG_STYLES = {
     'default': {'style': 'whitegrid', 'grid_alpha': 0.3},
@@ -44,51 +63,138 @@ BG_STYLES = {
     'presentation': {'style': 'white', 'grid_alpha': 0.2}
 }
 
+# Modification time of the source data file (see set_source_mtime)
+_SOURCE_MTIME = None
+
+def set_source_mtime(mtime):
+    """
+    Set the modification time of the source data file.
+    
+    Saved charts newer than this are treated as up to date: plot_bar_chart skips
+    rendering them (unless the plot is shown) and returns (None, None), provided
+    they were rendered with the same options, data and version of this module.
+    Pass None to always render.
+    """
+    global _SOURCE_MTIME
+    _SOURCE_MTIME = mtime
+
+# Fingerprint of this module's source, so charts are re-rendered after a code change
+with open(__file__, 'rb') as _source_file:
+    _CODE_HASH = hashlib.sha1(_source_file.read()).hexdigest()
+
+def _render_key(render_args, data):
+    """Hash the plot options, the plotted data and the module version into one key."""
+    args = {name: value.tolist() if isinstance(value, (pd.Index, np.ndarray)) else value
+            for name, value in render_args.items()}
+    key = hashlib.sha1(f"{_CODE_HASH}{args!r}".encode())
+    key.update(pd.util.hash_pandas_object(data).to_numpy().tobytes())
+    return key.hexdigest()
+
+def _render_key_path(save_path):
+    """Hidden sidecar next to a saved chart holding the key it was rendered with."""
+    directory, name = os.path.split(str(save_path))
+    return os.path.join(directory, f".{name}.key")
+
+def _is_up_to_date(save_path, render_key):
+    """Check whether save_path was written after the source data last changed, with the same render key."""
+    if save_path is None or _SOURCE_MTIME is None:
+        return False
+    if not os.path.exists(save_path) or os.path.getmtime(save_path) <= _SOURCE_MTIME:
+        return False
+    try:
+        with open(_render_key_path(save_path)) as key_file:
+            return key_file.read() == render_key
+    except OSError:
+        return False
+
+# Seaborn style most recently applied by _apply_style, with the rcParams it produced
+_applied_style = None
+
+def _apply_style(style):
+    """
+    Apply a seaborn style, skipping the rcParams rewrite if it is still active.
+    
+    The style only counts as active while rcParams match what set_theme left behind,
+    so changes made elsewhere (plt.style, sns.set_*) cause it to be re-applied.
+    """
+    global _applied_style
+    if _applied_style is not None and _applied_style[0] == style and _applied_style[1] == plt.rcParams:
+        return
+    sns.set_theme(style=style)
+    _applied_style = (style, dict(plt.rcParams))
+
 def _format_value(value, is_percentage=False, precision=None):
     """Format values appropriately based on type and magnitude."""
-    if pd.isna(value):
-        return "N/A"
+    return _format_column([value], is_percentage=is_percentage, precision=precision)[0]
+
+def _pick_precision(abs_arr, is_percentage):
+    """Select the display precision for each value from its magnitude using NumPy masks."""
+    if is_percentage:
+        return np.where(abs_arr < 0.01, 2, 1)
+    return np.select(
+        [abs_arr < 0.01, abs_arr < 0.1, abs_arr < 1, abs_arr < 10, abs_arr % 1 < 0.01],
+        [4, 3, 2, 1, 0],
+        default=2
+    )
+
+def _pick_precision_loop(abs_arr, is_percentage):
+    """Same ladder as _pick_precision as a single typed loop - only used compiled by Numba."""
+    prec = np.empty(abs_arr.shape, dtype=np.int8)
+    for i in range(abs_arr.size):
+        value = abs_arr[i]
+        if is_percentage:
+            prec[i] = 2 if value < 0.01 else 1
+        elif value < 0.01:
+            prec[i] = 4
+        elif value < 0.1:
+            prec[i] = 3
+        elif value < 1:
+            prec[i] = 2
+        elif value < 10:
+            prec[i] = 1
+        else:
+            prec[i] = 0 if value % 1 < 0.01 else 2
+    return prec
+
+if njit is not None:
+    _pick_precision = njit(cache=True)(_pick_precision_loop)
+
+def _format_column(values, is_percentage=False, precision=None):
+    """Format a whole column of values at once, picking every precision in one _pick_precision call."""
+    arr = np.asarray(values, dtype=float)
+    nan_mask = np.isnan(arr)
+    abs_arr = np.abs(arr)
     
     if is_percentage:
         if precision is None:
-            if abs(value) < 0.01:
-                precision = 2
-            else:
-                precision = 1
-        return f'{value:.{precision}%}'
-    
-    # If value is very close to an integer and >= 10
-    if abs(value - round(value)) < 0.01 and value >= 10:
-        return f'{int(value):,}'
+            prec = _pick_precision(abs_arr, True)
+        else:
+            prec = np.full(arr.shape, precision)
+        return ["N/A" if is_nan else f'{value:.{p}%}'
+                for value, p, is_nan in zip(arr.tolist(), prec.tolist(), nan_mask.tolist())]
     
     # Select precision based on value magnitude if not specified
     if precision is None:
-        if abs(value) < 0.01:
-            precision = 4
-        elif abs(value) < 0.1:
-            precision = 3
-        elif abs(value) < 1:
-            precision = 2
-        elif abs(value) < 10:
-            precision = 1
-        else:
-            precision = 0 if abs(value) % 1 < 0.01 else 2
-    
-    # Format with appropriate precision
-    if precision == 0:
-        return f'{int(value):,}'
+        prec = _pick_precision(abs_arr, False)
     else:
-        return f'{value:.{precision}f}'
+        prec = np.full(arr.shape, precision)
+    
+    # Values very close to an integer and >= 10, or with zero precision, are shown as integers
+    as_int = ((np.abs(arr - np.round(arr)) < 0.01) & (arr >= 10)) | (prec == 0)
+    
+    return ["N/A" if is_nan else f'{int(value):,}' if is_int else f'{value:.{p}f}'
+            for value, p, is_nan, is_int in zip(arr.tolist(), prec.tolist(), nan_mask.tolist(), as_int.tolist())]
 
 def _wrap_text(text, width=20):
     """Wrap text to specified width."""
     return '\n'.join(textwrap.wrap(text, width=width))
 
+@lru_cache(maxsize=64)
 def _get_gradient_colors(color_scheme, num_categories):
-    """Get a gradient of colors for a given color scheme."""
-    if isinstance(color_scheme, list):
-        # Use provided list of colors
-        colors = color_scheme
+    """Get a gradient of colors for a given color scheme (cached per scheme and size)."""
+    if isinstance(color_scheme, tuple):
+        # Use provided colors (passed as a tuple so they can be cached)
+        colors = list(color_scheme)
     elif color_scheme in COLOR_SCHEMES:
         # Use predefined color scheme
         colors = COLOR_SCHEMES[color_scheme]
@@ -100,10 +206,15 @@ def _get_gradient_colors(color_scheme, num_categories):
     if len(colors) < num_categories:
         # Create a gradient from the first and last colors
         base_cmap = LinearSegmentedColormap.from_list("custom", [colors[0], colors[-1]])
-        return [base_cmap(i/float(num_categories-1)) for i in range(num_categories)]
+        return tuple(base_cmap(i/float(num_categories-1)) for i in range(num_categories))
     
     # Return the needed number of colors
-    return colors[:num_categories]
+    return tuple(colors[:num_categories])
+
+def group_columns(columns, group_size=4):
+    """Split columns into consecutive groups of group_size (the last group may be smaller)."""
+    cols = np.asarray(columns, dtype=object)
+    return [group.tolist() for group in np.split(cols, range(group_size, len(cols), group_size)) if len(group)]
 
 def plot_bar_chart(
     df, columns, 
@@ -135,7 +246,9 @@ def plot_bar_chart(
     bar_edge_color=None,  # Edge color for bars
     bar_edge_width=0,  # Edge width for bars
     bar_alpha=0.9,  # Opacity of bars
-    annotate_offset=(0, 5)  # Offset for value annotations (x, y)
+    annotate_offset=(0, 5),  # Offset for value annotations (x, y)
+    fig=None,  # Existing figure to draw into instead of creating a new one
+    palette_png=False  # Save PNGs as 8-bit palette images
 ):
     """
     Create customizable bar charts for HDFC data analysis.
@@ -204,9 +317,17 @@ def plot_bar_chart(
         Opacity of bars (0-1)
     annotate_offset : tuple, optional
         Offset position for value annotations (x, y)
+    fig : matplotlib Figure, optional
+        Existing figure to clear and draw into (the caller keeps ownership of it)
+    palette_png : bool, optional
+        Save PNG output as a 64-color palette image (smaller files, slightly
+        less smooth text antialiasing)
     """
-    # Prepare the data
-    data = df.copy()
+    # Every option that affects the saved image (captured before any other local is set)
+    render_args = {name: value for name, value in locals().items() if name not in ('df', 'fig', 'show_plot')}
+    
+    # Prepare the data (read-only, so no copy is needed)
+    data = df
     if isinstance(columns, str):
         columns = [columns]
     
@@ -215,9 +336,14 @@ def plot_bar_chart(
     if not valid_columns:
         raise ValueError(f"None of the specified columns exist in the dataframe. Available columns: {data.columns.tolist()}")
     
-    # Set index name if provided
+    # Skip charts already saved after the source data last changed, with the same options
+    render_key = _render_key(render_args, df[valid_columns]) if save_path else None
+    if not show_plot and _is_up_to_date(save_path, render_key):
+        return None, None
+    
+    # Set index name if provided, without touching the caller's DataFrame
     if index_name:
-        data.index.name = index_name
+        data = df.rename_axis(index_name)
     
     # Determine appropriate figure size if not specified
     if figsize is None:
@@ -239,16 +365,32 @@ def plot_bar_chart(
     
     # Set style
     style_settings = BG_STYLES.get(bg_style, BG_STYLES['default'])
-    sns.set_theme(style=style_settings['style'])
+    _apply_style(style_settings['style'])
     
-    # Create subplots
-    fig, axes = plt.subplots(layout[0], layout[1], figsize=figsize, sharey=sharey)
+    # Create subplots, reusing the caller's figure if one was given
+    owns_figure = fig is None
+    if owns_figure:
+        fig, axes = plt.subplots(layout[0], layout[1], figsize=figsize, sharey=sharey, layout='constrained')
+    else:
+        fig.clear()
+        fig.set_size_inches(figsize)
+        fig.set_layout_engine('constrained')
+        axes = fig.subplots(layout[0], layout[1], sharey=sharey)
     
     # Ensure axes is always a flattened array
     if layout[0] == 1 and layout[1] == 1:
         axes = np.array([axes])
     axes = np.array(axes).flatten()
     
+    # Get appropriate colors (the same for every subplot)
+    if isinstance(color_scheme, list):
+        color_scheme = tuple(color_scheme)
+    colors = list(_get_gradient_colors(color_scheme, len(data)))
+    
+    # Bar positions and category labels are shared by every subplot
+    x_pos = np.arange(len(data))
+    xticklabels = data.index.tolist()
+    
     # Process each column and create plots
     for i, col in enumerate(valid_columns):
         if i >= len(axes):  # Safety check
@@ -267,22 +409,25 @@ def plot_bar_chart(
             # Auto-detect percentage columns
             is_percentage = '%' in col.lower()
         
-        # Get appropriate colors
-        colors = _get_gradient_colors(color_scheme, len(data))
-          # Create the bar plot (updated for newer Seaborn API)
-        sns.barplot(
-            ax=ax,
-            x=data.index,
-            y=data[col],
-            hue=data.index,  # Use index values for hue to maintain color control
-            palette=colors if isinstance(colors[0], tuple) else colors,
-            saturation=1.0,
+        # Column values as a float array, shared by the bars, y-axis label and annotations
+        col_arr = data[col].to_numpy(dtype=float, na_value=np.nan)
+        
+        # Create the bar plot - one bar per category, so no seaborn aggregation is needed
+        bars = ax.bar(
+            x_pos,
+            col_arr,
             width=bar_width,
+            color=colors,
             edgecolor=bar_edge_color,
             linewidth=bar_edge_width,
-            alpha=bar_alpha,
-            legend=False  # Don't show the legend for the hue
+            alpha=bar_alpha
         )
+        ax.set_xticks(x_pos)
+        ax.set_xticklabels(xticklabels)
+        
+        # Match seaborn's categorical axis: bars centered in the view, no vertical grid
+        ax.set_xlim(-0.5, len(data) - 0.5)
+        ax.xaxis.grid(False)
         
         # Set column title (use custom if provided, otherwise the column name)
         if column_titles and col in column_titles:
@@ -312,7 +457,8 @@ def plot_bar_chart(
             ax.set_ylabel("Percentage", fontsize=label_fontsize, labelpad=10)
         else:
             # Check if all values are integers
-            all_integers = all(abs(v - round(v)) < 0.01 for v in data[col].dropna())
+            valid_values = col_arr[~np.isnan(col_arr)]
+            all_integers = bool(np.all(np.abs(valid_values - np.round(valid_values)) < 0.01))
             if all_integers:
                 ax.set_ylabel("Count", fontsize=label_fontsize, labelpad=10)
             else:
@@ -324,28 +470,25 @@ def plot_bar_chart(
         
         # Annotate bars with values
         if show_values:
-            for p in ax.patches:
-                value = p.get_height()
-                
-                # Format the value
-                label = _format_value(value, is_percentage=is_percentage, precision=precision)
-                
-                # Add the annotation with a subtle shadow effect for better visibility
-                text = ax.annotate(
-                    label,
-                    (p.get_x() + p.get_width() / 2., value),
-                    ha='center', va='bottom',
-                    size=value_fontsize, fontweight="bold", color="#303030",
-                    xytext=(annotate_offset[0], annotate_offset[1]),
-                    textcoords='offset points',
-                    rotation=value_rotation
-                )
-                
-                # Add subtle shadow effect for better visibility
-                text.set_path_effects([
-                    path_effects.Stroke(linewidth=2, foreground='white'),
-                    path_effects.Normal()
-                ])
+            # Subtle shadow effect for better visibility, shared by all labels
+            shadow = [
+                path_effects.Stroke(linewidth=2, foreground='white'),
+                path_effects.Normal()
+            ]
+            
+            # Label all bars in a single call
+            labels = _format_column(col_arr, is_percentage=is_percentage, precision=precision)
+            texts = ax.bar_label(
+                bars,
+                labels=labels,
+                padding=annotate_offset[1],
+                fontsize=value_fontsize, fontweight="bold", color="#303030",
+                rotation=value_rotation
+            )
+            
+            for text in texts:
+                text.xyann = (annotate_offset[0], text.xyann[1])
+                text.set_path_effects(shadow)
         
         # Add grid lines if requested
         if grid:
@@ -355,35 +498,57 @@ def plot_bar_chart(
             
         # Add legend if requested
         if legend:
-            ax.legend(data.index, title=data.index.name or "Category", 
+            ax.legend(bars.patches, xticklabels, title=data.index.name or "Category", 
                      loc='upper right', fontsize=label_fontsize-2)
     
     # Remove any unused axes
     for j in range(len(valid_columns), len(axes)):
         fig.delaxes(axes[j])
-      # Adjust layout with increased spacing between subplots
-    plt.subplots_adjust(top=0.85, hspace=0.7, wspace=0.5)
     
     # Add overall title and subtitle
     if title:
-        fig.suptitle(title, fontsize=title_fontsize, fontweight="bold", y=0.98)
+        suptitle = fig.suptitle(title, fontsize=title_fontsize, fontweight="bold")
         
-        # Add subtitle if provided
+        # Add subtitle if provided, anchored just below the title
         if subtitle:
-            plt.figtext(0.5, 0.94, subtitle, horizontalalignment='center', 
-                       fontsize=subtitle_fontsize, fontstyle='italic')
-      # Tight layout with better spacing (but preserving the top for titles)
-    plt.tight_layout(rect=[0, 0.05, 1, 0.93 if subtitle else 0.95])
+            fig.add_artist(Annotation(
+                subtitle, xy=(0.5, 0), xycoords=suptitle,
+                xytext=(0, -4), textcoords='offset points',
+                horizontalalignment='center', verticalalignment='top',
+                fontsize=subtitle_fontsize, fontstyle='italic'
+            ))
+            
+            # Constrained layout only reserves room for the title, so leave space for the subtitle too
+            subtitle_height = (1.5 * subtitle_fontsize + 4) / 72 / fig.get_figheight()
+            fig.get_layout_engine().set(rect=(0, 0, 1, 1 - subtitle_height))
     
     # Save figure if path is provided
     if save_path:
-        plt.savefig(save_path, dpi=dpi, bbox_inches='tight')
+        save_kwargs = {}
+        ext = os.path.splitext(str(save_path))[1].lower()
+        if ext in _PIL_KWARGS:
+            save_kwargs['pil_kwargs'] = _PIL_KWARGS[ext]
+        
+        if palette_png and ext == '.png':
+            # Render in memory, then store as an 8-bit palette PNG
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', dpi=dpi, **save_kwargs)
+            buffer.seek(0)
+            with Image.open(buffer) as image:
+                palette_image = image.quantize(colors=64, method=Image.Quantize.FASTOCTREE)
+                palette_image.save(save_path, dpi=(dpi, dpi), **_PIL_KWARGS['.png'])
+        else:
+            fig.savefig(save_path, dpi=dpi, **save_kwargs)
+        
+        with open(_render_key_path(save_path), 'w') as key_file:
+            key_file.write(render_key)
     
     # Show plot if requested
     if show_plot:
         plt.show()
-    else:
-        plt.close()
+    elif owns_figure:
+        # Release the figure straight away so it isn't kept by pyplot
+        plt.close(fig)
     
     # Return figure and axes for further customization if needed
     return fig, axes
@@ -406,7 +571,8 @@ def create_dashboard(
     value_formats=None,  # Nested dict {group_id: {col_name: {is_percentage, precision}}}
     global_xlabel=None,  # Global x-label for all charts
     global_ylabel=None,  # Global y-label for all charts
-    figsize=None  # Override default figsize
+    figsize=None,  # Override default figsize
+    palette_png=False  # Save PNGs as 8-bit palette images
 ):
     """
     Create a comprehensive dashboard with multiple chart groups.
@@ -447,29 +613,27 @@ def create_dashboard(
         Y-axis label for all charts
     figsize : tuple, optional
         Override default figure size
+    palette_png : bool, optional
+        Save PNG charts as 64-color palette images
         
     Returns:
     --------
-    list : List of (fig, axes) tuples for each chart group
+    list : List of (fig, axes) tuples for each chart group. When show_plots is
+        False all groups are drawn into one reused figure, so only the last
+        group's axes are still attached to it.
     """
     results = []
     
+    # When nothing is displayed, draw every group into one reusable figure
+    shared_fig = None if show_plots else Figure()
+    
     # Default color schemes if not provided
     if color_schemes is None:
         color_schemes = ['corporate', 'hdfc_brand', 'vibrant', 'pastel', 'gradient_blue', 'gradient_red']
     
     # Auto-create column groups if not provided
     if column_groups is None:
-        if len(df.columns) <= 4:
-            column_groups = [df.columns.tolist()]
-        else:
-            # Group columns into groups of 3-4
-            column_groups = []
-            cols = df.columns.tolist()
-            for i in range(0, len(cols), 4):
-                group = cols[i:i+4]
-                if group:  # Add only non-empty groups
-                    column_groups.append(group)
+        column_groups = group_columns(df.columns)
     
     # Process each group
     for i, columns in enumerate(column_groups):
@@ -529,7 +693,9 @@ def create_dashboard(
             save_path=save_path,
             dpi=dpi,
             show_plot=show_plots,
-            figsize=figsize
+            figsize=figsize,
+            fig=shared_fig,
+            palette_png=palette_png
         )
         
         results.append((fig, axes))
@@ -1,6 +1,7 @@
-import pandas as pd
 import os
 import shutil
+import pandas as pd
+from openpyxl import load_workbook, Workbook
 
 # Create a backup of the original file
 original_file = 'HDFC.xlsx'
@@ -12,45 +13,80 @@ if not os.path.exists(backup_file):
     shutil.copy2(original_file, backup_file)
     print("Backup created successfully")
 
-# Read the Excel file
-excel_file = pd.ExcelFile(original_file)
-sheet_names = excel_file.sheet_names
+# Open the workbook in streaming read-only mode (cached values, no formulas)
+workbook = load_workbook(original_file, read_only=True, data_only=True)
+sheet_names = workbook.sheetnames
 
 print(f"Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
 
-# Create a writer to save the modified sheets
-with pd.ExcelWriter('HDFC_modified.xlsx') as writer:
+# Create a write-only workbook that streams the kept rows to disk
+modified_workbook = Workbook(write_only=True)
+
+# Process each sheet
+for sheet_name in sheet_names:
+    print(f"\nProcessing sheet: {sheet_name}")
+    
+    rows = workbook[sheet_name].iter_rows(values_only=True)
+    output_sheet = modified_workbook.create_sheet(sheet_name)
+    
+    # Copy the header row unchanged
+    header = next(rows, None)
+    if header is None:
+        print("Empty sheet, nothing to remove")
+        continue
+    output_sheet.append(header)
+    
+    # Match "Sub total" in the Category column if it exists, otherwise in any cell
+    category_idx = header.index("Category") if "Category" in header else None
     
-    # Process each sheet
-    for sheet_name in sheet_names:
-        print(f"\nProcessing sheet: {sheet_name}")
-        
-        # Read the sheet with "Category" as index if it exists
+    # Stream the remaining rows, skipping "Sub total"
+    original_rows = 0
+    kept_rows = 0
+    for row in rows:
+        original_rows += 1
+        cells = row if category_idx is None else (row[category_idx],)
+        if "Sub total" not in cells:
+            output_sheet.append(row)
+            kept_rows += 1
+    
+    print(f"Original rows: {original_rows}")
+    if kept_rows < original_rows:
+        print(f"Removed 'Sub total' row from sheet '{sheet_name}'")
+    print(f"New rows: {kept_rows}")
+
+workbook.close()
+
+# Save the modified sheets
+modified_workbook.save('HDFC_modified.xlsx')
+
+# Cache each cleaned sheet as Parquet so the dashboard scripts can skip Excel parsing.
+# The source path and mtime are stored with each sheet so readers can tell which file it was built from.
+source = {'source_path': os.path.abspath('HDFC_modified.xlsx'),
+          'source_mtime': os.path.getmtime('HDFC_modified.xlsx')}
+cache_dir = os.path.join('cache', 'HDFC_modified')
+
+# Read the cleaned sheets back from the saved file so the cache holds exactly what
+# read_excel returns (NA strings, error cells and the float precision openpyxl writes)
+cleaned_sheets = pd.read_excel('HDFC_modified.xlsx', sheet_name=None, engine="openpyxl")
+
+os.makedirs(cache_dir, exist_ok=True)
+try:
+    cached = []
+    for sheet_name, df in cleaned_sheets.items():
+        cache_path = os.path.join(cache_dir, f"{sheet_name}.parquet")
+        df.attrs.update(source)
         try:
-            df = pd.read_excel(original_file, sheet_name=sheet_name, index_col="Category")
-            has_category_index = True
-        except:
-            df = pd.read_excel(original_file, sheet_name=sheet_name)
-            has_category_index = False
-        
-        print(f"Original shape: {df.shape}")
-        
-        # Remove "Sub total" row if it exists
-        if has_category_index and "Sub total" in df.index:
-            df = df.drop("Sub total")
-            print(f"Removed 'Sub total' row from sheet '{sheet_name}'")
-        elif not has_category_index and "Sub total" in df.values:
-            # Find column that might contain "Sub total"
-            for col in df.columns:
-                mask = df[col] == "Sub total"
-                if mask.any():
-                    df = df[~mask]
-                    print(f"Removed 'Sub total' row from sheet '{sheet_name}' in column '{col}'")
-        
-        print(f"New shape: {df.shape}")
-        
-        # Save to the new file
-        df.to_excel(writer, sheet_name=sheet_name, index=has_category_index)
+            df.to_parquet(cache_path, index=False)
+            cached.append(sheet_name)
+        except (TypeError, ValueError) as e:
+            # Columns with mixed types can't be stored - readers fall back to the Excel file
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            print(f"Could not cache sheet '{sheet_name}' as Parquet: {e}")
+    if cached:
+        print(f"Cached {len(cached)} of {len(cleaned_sheets)} cleaned sheets as Parquet in '{cache_dir}': {', '.join(cached)}")
+except ImportError:
+    print("Parquet support (pyarrow) is not installed - skipping the Parquet cache")
 
 print("\nFinished processing all sheets.")
 print("Modified file saved as 'HDFC_modified.xlsx'")
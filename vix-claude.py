@@ -1,13 +1,82 @@
+import logging
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from matplotlib.collections import PatchCollection
+from matplotlib.container import BarContainer
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch, Rectangle
 import numpy as np
 from math import ceil
+from pandas.api.types import is_list_like
+from functools import lru_cache
+
+# calamine parses the workbook in Rust without building openpyxl's cell tree;
+# fall back to openpyxl when python-calamine isn't installed
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+log = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - bar labels then use the vectorized NumPy path
+    njit = None
+
+@lru_cache(maxsize=32)
+def _palette(name, n, alpha=1.0):
+    """Cached seaborn palette as RGBA tuples, shared by every subplot with the same bar count"""
+    return tuple((r, g, b, alpha) for r, g, b in sns.color_palette(name, n))
+
+_UNDER2SPACE = str.maketrans({'_': ' '})
+
+@lru_cache(maxsize=None)
+def _pretty(s):
+    """Turn a column name like 'CAP_12_cohort' into a display label"""
+    return s.translate(_UNDER2SPACE).title()
+
+def format_heights(heights):
+    """Bar value labels for one column, with empty strings at NaN positions"""
+    # NaN check, magnitude test and formatting run once over the whole column
+    small = np.abs(heights) < 1000
+    labels = np.where(small, np.char.mod('%.2f', heights), np.char.mod('%.0f', heights))
+    return np.where(np.isnan(heights), '', labels).tolist()
+
+if njit is not None:
+    @njit(cache=__name__ == "__main__")  # the on-disk cache needs an importable module name
+    def _label_decimals(heights):
+        """Decimals for each bar label: 2 below 1000, 0 above, -1 for NaN (no label)"""
+        decimals = np.empty(heights.shape, dtype=np.int8)
+        for i in range(heights.size):
+            value = heights[i]
+            if np.isnan(value):
+                decimals[i] = -1
+            elif abs(value) < 1000:
+                decimals[i] = 2
+            else:
+                decimals[i] = 0
+        return decimals
+    
+    def format_heights(heights):
+        """Bar value labels for one column, with empty strings at NaN positions"""
+        return ['' if d < 0 else f'{v:.{d}f}'
+                for v, d in zip(heights.tolist(), _label_decimals(heights).tolist())]
+
+def _categories(df, category_col):
+    """Category values and axis label from a column name or an array-like such as df.index"""
+    if is_list_like(category_col):
+        return np.asarray(category_col), getattr(category_col, 'name', None) or 'Category'
+    return df[category_col].to_numpy(), category_col
 
 def create_grouped_barplots(df, column_groups, category_col='Category', 
                            figsize_per_subplot=(12, 8), title_fontsize=18, 
                            axis_label_fontsize=14, tick_label_fontsize=12, 
-                           rotation=45, color_palette='Set2'):
+                           rotation=45, color_palette='Set2', render='show',
+                           output_path=None, dpi=150):
     """
     Create bar plots with custom column groupings
     
@@ -18,76 +87,122 @@ def create_grouped_barplots(df, column_groups, category_col='Category',
     column_groups : list of lists
         Each inner list contains column names to be plotted together
         Example: [['col1', 'col2'], ['col3', 'col4', 'col5']]
-    category_col : str
-        The column name to use as x-axis categories
+    category_col : str or array-like
+        The column name to use as x-axis categories, or the categories
+        themselves (e.g. df.index) so the frame doesn't need reset_index()
     figsize_per_subplot : tuple
         Size of each subplot (width, height)
+    render : str
+        'show' opens the figure with plt.show(), 'file' saves it to output_path
+        and 'none' just returns it. 'file' and 'none' build the figure outside
+        pyplot, so no GUI backend is started.
+    output_path : str
+        Where to save the figure when render='file'
+    dpi : int
+        Resolution of the saved image when render='file'
     Other parameters: formatting options
     """
     
+    if render not in ('show', 'file', 'none'):
+        raise ValueError(f"render must be 'show', 'file' or 'none', got {render!r}")
+    if render == 'file' and output_path is None:
+        raise ValueError("output_path is required when render='file'")
+    
+    # Drop missing columns and empty groups up front so the figure is only sized for what gets drawn
+    column_groups = [[col for col in group if col in df.columns] for group in column_groups]
+    column_groups = [group for group in column_groups if group]
+    if not column_groups:
+        raise ValueError(f"None of the specified columns exist in the dataframe. Available columns: {df.columns.tolist()}")
+    
     n_subplots = len(column_groups)
     
+    # Pull the categories and every plotted column out of the DataFrame once
+    cat_arr, category_name = _categories(df, category_col)
+    n_cats = len(df)
+    x_positions = np.arange(n_cats)
+    all_cols = set().union(*column_groups)
+    col_arrays = {c: df[c].to_numpy(dtype=float) for c in all_cols}
+    
     # Create figure with subplots arranged vertically for better readability
-    fig, axes = plt.subplots(n_subplots, 1, figsize=(figsize_per_subplot[0], 
-                                                     figsize_per_subplot[1] * n_subplots))
+    figsize = (figsize_per_subplot[0], figsize_per_subplot[1] * n_subplots)
+    if render == 'show':
+        fig, axes = plt.subplots(n_subplots, 1, figsize=figsize, sharex=True)
+    else:
+        fig = Figure(figsize=figsize)
+        axes = fig.subplots(n_subplots, 1, sharex=True)
     
     # Handle case where there's only one subplot
     if n_subplots == 1:
         axes = [axes]
     
     # Process each group
-    for i, group_cols in enumerate(column_groups):
+    for i, valid_cols in enumerate(column_groups):
         ax = axes[i]
         
-        # Filter valid columns that exist in dataframe
-        valid_cols = [col for col in group_cols if col in df.columns]
-        
-        if not valid_cols:
-            ax.set_visible(False)
-            continue
-        
         # Prepare data for grouped bar plot
-        x_positions = np.arange(len(df[category_col]))
-        bar_width = 0.8 / len(valid_cols)  # Adjust width based on number of bars
+        n_bars = len(valid_cols)
+        bar_width = 0.8 / n_bars  # Adjust width based on number of bars
+        offsets = (np.arange(n_bars) - n_bars/2 + 0.5) * bar_width
+        
+        # Bar transparency is baked into the RGBA colors rather than applied via alpha=
+        # Lists of colors are made hashable for the palette cache
+        colors = _palette(tuple(color_palette) if isinstance(color_palette, list) else color_palette,
+                          n_bars, alpha=0.8)
         
-        colors = sns.color_palette(color_palette, len(valid_cols))
+        # Stack the group into a (n_cols, n_categories) array and draw every bar
+        # as one PatchCollection instead of one BarContainer per column;
+        # bar centres and left edges are both built with a single broadcast
+        data = np.stack([col_arrays[col] for col in valid_cols])
+        xs = x_positions[None, :] + offsets[:, None]
+        lefts = xs - bar_width/2
+        rects = [Rectangle((x, 0), bar_width, h)
+                 for x, h in zip(lefts.ravel().tolist(), data.ravel().tolist())]
+        bars = PatchCollection(rects, facecolors=np.repeat(colors, n_cats, axis=0))
+        bars.sticky_edges.y.append(0)
+        ax.add_collection(bars)
+        ax.autoscale_view()
+        pretty_cols = [_pretty(col) for col in valid_cols]
+        handles = [Patch(facecolor=colors[j], label=label)
+                   for j, label in enumerate(pretty_cols)]
         
-        # Create bars for each column in the group
-        for j, col in enumerate(valid_cols):
-            offset = (j - len(valid_cols)/2 + 0.5) * bar_width
-            bars = ax.bar(x_positions + offset, df[col], bar_width, 
-                         label=col.replace('_', ' ').title(), color=colors[j], alpha=0.8)
+        for j in range(n_bars):
+            heights = data[j]
             
             # Add value labels on bars (optional - comment out if too cluttered)
-            for bar in bars:
-                height = bar.get_height()
-                if not pd.isna(height):
-                    ax.text(bar.get_x() + bar.get_width()/2., height,
-                           f'{height:.2f}' if abs(height) < 1000 else f'{height:.0f}',
-                           ha='center', va='bottom', fontsize=tick_label_fontsize-2,
-                           rotation=0)
+            # Labels are formatted once per column; NaN bars get an empty label
+            labels = format_heights(heights)
+            column_bars = BarContainer(rects[j*n_cats:(j+1)*n_cats], datavalues=heights,
+                                       orientation='vertical')
+            ax.bar_label(column_bars, labels=labels,
+                         fontsize=tick_label_fontsize-2, padding=1)
         
         # Format the subplot
-        group_title = f"Group {i+1}: " + " | ".join([col.replace('_', ' ').title() for col in valid_cols[:2]])
+        group_title = f"Group {i+1}: " + " | ".join(pretty_cols[:2])
         if len(valid_cols) > 2:
             group_title += f"\n+ {len(valid_cols)-2} more columns"
         
         ax.set_title(group_title, fontsize=title_fontsize, fontweight='bold', pad=20)
-        ax.set_xlabel(category_col.replace('_', ' ').title(), fontsize=axis_label_fontsize, fontweight='bold')
         ax.set_ylabel('Values', fontsize=axis_label_fontsize, fontweight='bold')
-        
-        # Set x-axis labels
-        ax.set_xticks(x_positions)
-        ax.set_xticklabels(df[category_col], rotation=rotation, fontsize=tick_label_fontsize)
+        ax.tick_params(axis='x', labelbottom=False)
         ax.tick_params(axis='y', labelsize=tick_label_fontsize)
         
         # Add legend and grid
-        ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=tick_label_fontsize)
+        ax.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=tick_label_fontsize)
         ax.grid(axis='y', alpha=0.3)
         ax.set_axisbelow(True)
     
-    plt.tight_layout()
-    plt.show()
+    # The x-axis is shared, so the category ticks and label only go on the bottom subplot
+    bottom_ax = axes[-1]
+    bottom_ax.set_xticks(x_positions)
+    bottom_ax.set_xticklabels(cat_arr, rotation=rotation, fontsize=tick_label_fontsize)
+    bottom_ax.tick_params(axis='x', labelbottom=True)
+    bottom_ax.set_xlabel(_pretty(category_name), fontsize=axis_label_fontsize, fontweight='bold')
+    
+    fig.tight_layout()
+    if render == 'show':
+        plt.show()
+    elif render == 'file':
+        fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
     
     return fig, axes
 
@@ -102,43 +217,18 @@ def create_predefined_groups_plot(df, category_col='Category', **kwargs):
     """
     
     # Get numeric columns (excluding category column)
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    if category_col in numeric_cols:
-        numeric_cols.remove(category_col)
-    
-    # Define the groups based on your requirements
-    column_groups = []
+    # An array-like category_col (e.g. df.index) isn't one of the columns
+    exclude = None if is_list_like(category_col) else category_col
+    numeric_cols = [col for col in df.select_dtypes(include='number').columns if col != exclude]
     
-    # Group 1: First 2 columns
-    if len(numeric_cols) >= 2:
-        column_groups.append(numeric_cols[0:2])
-    elif len(numeric_cols) > 0:
-        column_groups.append(numeric_cols[0:1])
-    
-    # Group 2: Next 4 columns (columns 2-5)
-    if len(numeric_cols) >= 6:
-        column_groups.append(numeric_cols[2:6])
-    elif len(numeric_cols) > 2:
-        column_groups.append(numeric_cols[2:min(6, len(numeric_cols))])
-    
-    # Group 3: Next 4 columns (columns 6-9)
-    if len(numeric_cols) >= 10:
-        column_groups.append(numeric_cols[6:10])
-    elif len(numeric_cols) > 6:
-        column_groups.append(numeric_cols[6:min(10, len(numeric_cols))])
-    
-    # Group 4: Next 2 columns (columns 10-11)
-    if len(numeric_cols) >= 12:
-        column_groups.append(numeric_cols[10:12])
-    elif len(numeric_cols) > 10:
-        column_groups.append(numeric_cols[10:min(12, len(numeric_cols))])
-    
-    # Group 5: Remaining columns (columns 12+)
-    if len(numeric_cols) > 12:
-        column_groups.append(numeric_cols[12:])
-    
-    # Remove empty groups
-    column_groups = [group for group in column_groups if group]
+    # Split at the group boundaries: 2 columns, then 4, 4, 2 and the remainder
+    boundaries = [2, 6, 10, 12]
+    column_groups = [
+        group.tolist()
+        for group in np.split(np.array(numeric_cols, dtype=object),
+                              [b for b in boundaries if b < len(numeric_cols)])
+        if len(group) > 0
+    ]
     
     print("Column Groups:")
     for i, group in enumerate(column_groups):
@@ -171,27 +261,30 @@ def load_sample_data():
     }
     return pd.DataFrame(data)
 
-# Example usage
-if __name__ == "__main__":
+@lru_cache(maxsize=4)
+def load_workbook_sheet(path, mtime, sheet_name="WorkStatus"):
+    """Read one sheet indexed by Category; mtime is part of the cache key so an edited workbook is re-read"""
+    return pd.read_excel(path, index_col="Category", sheet_name=sheet_name, engine=EXCEL_ENGINE)
+
+def main(path='HDFC_modified.xlsx'):
+    """Plot the WorkStatus sheet of the workbook with the predefined and custom groupings"""
     # Load your dataframe (replace with your actual dataframe loading)
+    df = load_workbook_sheet(path, os.path.getmtime(path))
     
-    df = pd.read_excel('HDFC_modified.xlsx', index_col="Category",sheet_name="WorkStatus")
-    
-    # First, let's check what columns you actually have
-    print("Available columns in your dataframe:")
-    print(df.columns.tolist())
-    print(f"\nDataframe shape: {df.shape}")
-    print(f"\nIndex name: {df.index.name}")
-    print(f"Index values: {df.index.tolist()}")
-    print("\nFirst few rows:")
-    print(df.head())
+    # First, let's check what columns you actually have (formatting the
+    # DataFrame repr is skipped entirely unless debug logging is on)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Available columns in your dataframe: %s", df.columns.tolist())
+        log.debug("Dataframe shape: %s", df.shape)
+        log.debug("Index name: %s", df.index.name)
+        log.debug("Index values: %s", df.index.tolist())
+        log.debug("First few rows:\n%s", df.head().to_string(max_cols=8))
     
     # Check if index contains categories (like Active/Inactive)
     if df.index.name is not None or len(df.index.unique()) > 1:
-        # Reset index to make it a column
-        df = df.reset_index()
-        category_col = df.columns[0]  # First column after reset_index
-        print(f"\nUsing index as category column: '{category_col}'")
+        # Pass the index itself rather than copying the frame with reset_index()
+        category_col = df.index
+        print(f"\nUsing index as category column: '{df.index.name}'")
     else:
         # Find the category column (usually the first non-numeric column)
         category_col = None
@@ -202,11 +295,15 @@ if __name__ == "__main__":
         
         if category_col is None:
             print("No categorical column found. Creating a simple index.")
-            df['Row'] = range(len(df))
+            df = df.assign(Row=range(len(df)))  # the loaded frame is cached, don't modify it
             category_col = 'Row'
     
-    print(f"\nUsing '{category_col}' as category column")
-    print(f"Categories: {df[category_col].unique()}")
+    categories, category_name = _categories(df, category_col)
+    print(f"\nUsing '{category_name}' as category column")
+    print(f"Categories: {pd.unique(categories)}")
+    
+    # Render straight to PNG instead of opening GUI windows
+    os.makedirs('exports', exist_ok=True)
     
     # Method 1: Use predefined grouping (your specific requirements)
     print("\n=== Using Predefined Groups ===")
@@ -216,7 +313,9 @@ if __name__ == "__main__":
             category_col=category_col,  # Use the detected category column
             figsize_per_subplot=(16, 8),
             title_fontsize=14,
-            rotation=0  # No rotation needed for Active/Inactive
+            rotation=0,  # No rotation needed for Active/Inactive
+            render='file',
+            output_path=os.path.join('exports', 'WorkStatus_predefined_groups.png')
         )
     except Exception as e:
         print(f"Error creating plots: {e}")
@@ -248,11 +347,26 @@ if __name__ == "__main__":
     ]
     
     # Use the complete custom groups:
-    fig2, axes2 = create_grouped_barplots(
-        df, 
-        custom_groups,
-        category_col='Category',
-        figsize_per_subplot=(16, 7),
-        title_fontsize=16,
-        rotation=0
-    )
\ No newline at end of file
+    try:
+        fig2, axes2 = create_grouped_barplots(
+            df, 
+            custom_groups,
+            category_col=category_col,
+            figsize_per_subplot=(16, 7),
+            title_fontsize=16,
+            rotation=0,
+            render='file',
+            output_path=os.path.join('exports', 'WorkStatus_custom_groups.png')
+        )
+    except Exception as e:
+        print(f"Error creating plots: {e}")
+        print("Please check your dataframe structure and column names")
+
+# Example usage
+if __name__ == "__main__":
+    # Set LOGLEVEL=DEBUG to print the dataframe overview in main()
+    level = os.environ.get('LOGLEVEL', 'INFO').upper()
+    if not isinstance(logging.getLevelName(level), int):
+        level = 'WARNING'  # unknown level name
+    logging.basicConfig(level=level, format='%(message)s')
+    main()